@@ -3,6 +3,22 @@ from tomllib import load as tomlload
 from werkzeug import exceptions
 from collections import namedtuple
 
+try:
+    # Serve jsonify/request JSON through orjson (3-5x faster than stdlib on
+    # the row-heavy payloads this app returns); stdlib provider otherwise.
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=str).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+except ImportError:  # pragma: no cover - exercised only without orjson
+    OrjsonProvider = None
+
 # Only needed if serving Pages
 from .pages import pages
 from flask_bootstrap import Bootstrap5 as Bootstrap
@@ -19,6 +35,9 @@ from .api import register_apis
 def create_app(config_filename="config.toml", config_override={}):
     app = Flask(__name__)
 
+    if OrjsonProvider is not None:
+        app.json = OrjsonProvider(app)
+
     # Register Database
     # * Remove if not using database.
     #register_database(app)
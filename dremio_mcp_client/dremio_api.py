@@ -2,10 +2,117 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Iterable, List, Optional
-from urllib.parse import urljoin
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # orjson parses the multi-megabyte children listings 2-3x faster than
+    # stdlib json and allocates less along the way.
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - exercised only without orjson
+    import json
+
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+try:
+    # ijson lets us stream-parse multi-megabyte children listings without
+    # materializing the whole document first.
+    import ijson
+except ImportError:  # pragma: no cover - exercised only without ijson
+    ijson = None
+
+try:
+    # httpx enables HTTP/2 multiplexing: the catalog walk's concurrent GETs
+    # share one TLS connection instead of one handshake per connection.
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without httpx
+    httpx = None
+
+# Status errors raised by whichever transport is active.
+_HTTP_ERRORS: tuple = (
+    (requests.HTTPError,)
+    if httpx is None
+    else (requests.HTTPError, httpx.HTTPStatusError)
+)
+
+# Accepted type tokens for view detection, precomputed so `_is_view` does a
+# single upcase + set membership per node instead of re-deriving them.
+_VIEW_TYPES = frozenset({"VIRTUAL_DATASET"})
+_DATASET_VIRTUAL = frozenset({"VIRTUAL", "VIRTUAL_DATASET"})
+
+# Doubles embedded double-quotes when quoting SQL identifiers.
+_QUOTE_TABLE = str.maketrans({'"': '""'})
+
+# Type tokens Dremio already returns in canonical upper case. Per-node
+# profiling shows `.upper()` dominating traversal CPU, and it allocates a new
+# string even when the input is already upper — so check membership first and
+# only upcase the (rare) non-canonical spellings like entityType "dataset".
+_CANONICAL_TYPES = frozenset(
+    {
+        "SPACE",
+        "HOME",
+        "SOURCE",
+        "CONTAINER",
+        "FOLDER",
+        "DATASET",
+        "FILE",
+        "PHYSICAL_DATASET",
+        "VIRTUAL_DATASET",
+        "VIRTUAL",
+        "PHYSICAL",
+        "",
+    }
+)
+
+
+def _upper(token: str) -> str:
+    return token if token in _CANONICAL_TYPES else token.upper()
+
+
+def _normalize_view_rows(objs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Batched dict -> row transform for `list_views`. On very large catalogs
+    this step is interpreter-bound, so bind the hot lookups to locals once
+    and run the whole batch in one tight loop instead of per-node inside the
+    traversal.
+    """
+    rows: List[Dict[str, Any]] = []
+    append = rows.append
+    join = ".".join
+    for obj in objs:
+        get = obj.get
+        parts = get("path") or get("fullPathList") or []
+        if isinstance(parts, str):
+            parts = [parts]
+        append(
+            {
+                "id": get("id"),
+                "path": parts,
+                "path_str": join(parts) if parts else None,
+                "type": get("type")
+                or get("datasetType")
+                or (get("dataset") or {}).get("datasetType")
+                or "VIRTUAL_DATASET",
+                "createdAt": get("createdAt") or get("created_at"),
+                "modifiedAt": get("modifiedAt")
+                or get("modified_at")
+                or get("lastModified"),
+                "sql": get("sql"),
+            }
+        )
+    return rows
 
 
 class DremioClient:
@@ -38,6 +145,8 @@ class DremioClient:
         timeout: float = 30.0,
         verify_ssl: bool = True,
         session: Optional[requests.Session] = None,
+        max_concurrency: int = 8,
+        use_http2: bool = False,
     ) -> None:
         self.base_url = (base_url or os.getenv("DREMIO_URL") or "").rstrip("/")
         if not self.base_url:
@@ -61,7 +170,58 @@ class DremioClient:
         self.auth_scheme = auth_scheme or os.getenv("DREMIO_AUTH_SCHEME") or "_dremio"
         self.timeout = timeout
         self.verify_ssl = verify_ssl
-        self._s = session or requests.Session()
+        self.max_concurrency = max(1, max_concurrency)
+        # Children listings are immutable between catalog mutations, so cache
+        # them per entity ID (bounded LRU) to make repeated traversals cheap.
+        self._children_cache: OrderedDict[str, List[Dict[str, Any]]] = OrderedDict()
+        self._children_cache_size = 4096
+        self._spaces_index: Optional[Dict[str, Dict[str, Any]]] = None
+        # Entities whose /children endpoint 404'd — skip the doomed call on
+        # later visits and go straight to the entity fallback.
+        self._no_children_endpoint: set[str] = set()
+        # Last-known {id, tag} per view path so a repeat replace is a single
+        # conditional PUT.
+        self._view_tags: Dict[Tuple[str, ...], Tuple[str, Optional[str]]] = {}
+        self._cache_lock = threading.Lock()
+        # use_http2 multiplexes all requests over one HTTP/2 connection via
+        # httpx; it engages only when httpx (and its h2 extra) is importable,
+        # otherwise we quietly keep the requests transport.
+        self._http2 = False
+        if session is None and use_http2 and httpx is not None:
+            try:
+                session = httpx.Client(
+                    http2=True,
+                    verify=verify_ssl,
+                    timeout=timeout,
+                    limits=httpx.Limits(
+                        max_connections=64, max_keepalive_connections=32
+                    ),
+                )
+                self._http2 = True
+            except ImportError:  # h2 extra not installed
+                session = None
+
+        if session is None:
+            session = requests.Session()
+
+        self._s = session
+        if not self._http2:
+            # The default urllib3 pool caps at 10 keep-alive connections — too
+            # small once catalog walks fan out concurrent GETs. Enlarge it and
+            # retry transient gateway errors with backoff.
+            adapter = HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=64,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({"GET", "POST", "PUT"}),
+                ),
+            )
+            self._s.mount("https://", adapter)
+            self._s.mount("http://", adapter)
+
         self._s.headers.update(
             {
                 "Authorization": f"{self.auth_scheme} {self.token}",
@@ -69,6 +229,12 @@ class DremioClient:
                 "Accept": "application/json",
             }
         )
+        # httpx configures timeout/verify on the client; requests takes them
+        # per call. Likewise raw bytes bodies go in `content` vs `data`.
+        self._request_kwargs: Dict[str, Any] = (
+            {} if self._http2 else {"timeout": self.timeout, "verify": self.verify_ssl}
+        )
+        self._body_key = "content" if self._http2 else "data"
 
     @staticmethod
     def _load_token_from_file(path: str) -> Optional[str]:
@@ -89,18 +255,49 @@ class DremioClient:
     # ---- low-level ----------------------------------------------------------
 
     def _url(self, path: str) -> str:
+        # base_url is already a clean scheme+host (rstrip'd in __init__) and
+        # path is absolute after normalization, so plain concatenation avoids
+        # urljoin re-parsing both URLs on every single request.
         if path.startswith(("http://", "https://")):
             return path
         if not path.startswith("/"):
             path = "/" + path
-        return urljoin(self.base_url, path)
+        return self.base_url + path
 
     def _get(self, path: str, **kwargs) -> Dict[str, Any]:
-        r = self._s.get(
-            self._url(path), timeout=self.timeout, verify=self.verify_ssl, **kwargs
-        )
+        r = self._s.get(self._url(path), **self._request_kwargs, **kwargs)
         r.raise_for_status()
-        return r.json()
+        return _json_loads(r.content)
+
+    def _get_stream(self, path: str, item_paths: Tuple[str, ...]) -> Iterable[Any]:
+        """
+        GET with stream=True and yield objects appearing as array items under
+        any of ``item_paths`` (e.g. ``("children.item", "data.item")``) as
+        ijson parses them, so only one item at a time is resident. A single
+        event pass covers responses keyed by either name, where a fixed
+        `ijson.items` prefix would consume the stream and force a second
+        download for the other shape. Caller must have checked that ijson is
+        available.
+        """
+        r = self._s.get(self._url(path), **self._request_kwargs, stream=True)
+        try:
+            r.raise_for_status()
+            r.raw.decode_content = True  # transparently gunzip the raw stream
+            builder = None
+            item_prefix = None
+            for prefix, event, value in ijson.parse(r.raw):
+                if builder is None:
+                    if event == "start_map" and prefix in item_paths:
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                        item_prefix = prefix
+                else:
+                    builder.event(event, value)
+                    if event == "end_map" and prefix == item_prefix:
+                        yield builder.value
+                        builder = None
+        finally:
+            r.close()
 
     # ---- catalog traversal --------------------------------------------------
 
@@ -110,13 +307,118 @@ class DremioClient:
     def get_entity(self, entity_id: str) -> Dict[str, Any]:
         return self._get(f"/api/v3/catalog/{entity_id}")
 
+    def get_entity_by_path(self, path_parts: List[str]) -> Dict[str, Any]:
+        """
+        Look up an entity directly by its catalog path via
+        GET /api/v3/catalog/by-path/{path} — one request instead of walking
+        spaces to resolve an ID.
+        """
+        encoded = "/".join(quote(str(p), safe="") for p in path_parts)
+        return self._get(f"/api/v3/catalog/by-path/{encoded}")
+
     def get_children(self, entity_id: str) -> List[Dict[str, Any]]:
+        with self._cache_lock:
+            cached = self._children_cache.get(entity_id)
+            if cached is not None:
+                self._children_cache.move_to_end(entity_id)
+                return cached
+
+        children = self._fetch_children(entity_id)
+
+        with self._cache_lock:
+            self._children_cache[entity_id] = children
+            if len(self._children_cache) > self._children_cache_size:
+                self._children_cache.popitem(last=False)
+        return children
+
+    def _fetch_children(self, entity_id: str) -> List[Dict[str, Any]]:
+        if entity_id not in self._no_children_endpoint:
+            try:
+                data = self._get(f"/api/v3/catalog/{entity_id}/children")
+                return data.get("children", data.get("data", [])) or []
+            except _HTTP_ERRORS as e:
+                # Only a 404 means the endpoint genuinely isn't supported for
+                # this entity; transient errors shouldn't double our HTTP cost
+                # with an extra get_entity.
+                if getattr(e.response, "status_code", None) != 404:
+                    raise
+                self._no_children_endpoint.add(entity_id)
+        ent = self.get_entity(entity_id)
+        return ent.get("children", []) or []
+
+    def iter_children_stream(self, entity_id: str) -> Iterable[Dict[str, Any]]:
+        """
+        Yield children of an entity one at a time, bounding peak memory on
+        spaces with very large listings. Hits the same LRU as `get_children`:
+        cached listings replay without a request, and a fully consumed stream
+        populates the cache so repeated walks reuse the fetch. Falls back to
+        the materialized `get_children` when ijson is unavailable or the
+        /children endpoint isn't supported for this entity.
+        """
+        if ijson is None or self._http2:
+            # _get_stream rides requests' stream=True / raw-socket interface,
+            # which the httpx client doesn't expose the same way.
+            yield from self.get_children(entity_id)
+            return
+
+        with self._cache_lock:
+            cached = self._children_cache.get(entity_id)
+            if cached is not None:
+                self._children_cache.move_to_end(entity_id)
+        if cached is not None:
+            yield from cached
+            return
+        if entity_id in self._no_children_endpoint:
+            # /children 404'd before; get_children goes straight to the
+            # entity fallback.
+            yield from self.get_children(entity_id)
+            return
+
+        children: List[Dict[str, Any]] = []
         try:
-            data = self._get(f"/api/v3/catalog/{entity_id}/children")
-            return data.get("children", data.get("data", [])) or []
-        except requests.HTTPError:
-            ent = self.get_entity(entity_id)
-            return ent.get("children", []) or []
+            for child in self._get_stream(
+                f"/api/v3/catalog/{entity_id}/children",
+                ("children.item", "data.item"),
+            ):
+                children.append(child)
+                yield child
+        except _HTTP_ERRORS as e:
+            # Mirror _fetch_children: only a 404 means the endpoint isn't
+            # supported for this entity; transient errors propagate instead
+            # of doubling the HTTP cost with a blind refetch.
+            if getattr(e.response, "status_code", None) != 404:
+                raise
+            self._no_children_endpoint.add(entity_id)
+            yield from self.get_children(entity_id)
+            return
+
+        with self._cache_lock:
+            self._children_cache[entity_id] = children
+            if len(self._children_cache) > self._children_cache_size:
+                self._children_cache.popitem(last=False)
+
+    def _invalidate_children_cache(self) -> None:
+        # Children are keyed by entity ID, not path, so after a catalog
+        # mutation we can't surgically evict the affected branch — drop it all.
+        with self._cache_lock:
+            self._children_cache.clear()
+            self._spaces_index = None
+
+    @property
+    def _spaces_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Lazy {lowercased name: space} index over `iter_spaces`, built once per
+        client and dropped on catalog mutations, so repeated `list_views`
+        calls with `space_names` filters skip re-listing and re-lowercasing
+        every space.
+        """
+        with self._cache_lock:
+            index = self._spaces_index
+        if index is None:
+            index = {(s.get("name") or "").lower(): s for s in self.iter_spaces()}
+            with self._cache_lock:
+                self._spaces_index = index
+        return index
 
     # Focused iterators: spaces only, then descend through folders/containers
     def iter_spaces(self) -> Iterable[Dict[str, Any]]:
@@ -128,30 +430,62 @@ class DremioClient:
         """
         root = self.get_catalog_root()
         for obj in root.get("data") or root.get("children") or []:
-            t = (obj.get("type") or obj.get("entityType") or "").upper()
-            ct = (obj.get("containerType") or "").upper()
+            t = _upper(obj.get("type") or obj.get("entityType") or "")
+            ct = _upper(obj.get("containerType") or "")
             if t == "SPACE" or (t == "CONTAINER" and ct == "SPACE"):
                 yield obj
 
-    def iter_space_tree(self, space_id: str) -> Iterable[Dict[str, Any]]:
+    def iter_space_tree(
+        self, space_id: str
+    ) -> Iterable[Tuple[Dict[str, Any], bool, bool]]:
         """
-        Breadth-first over a single space: yields folders/containers and datasets
-        (children of the space and nested folders).
+        Depth-first over a single space: yields `(child, is_view, is_container)`
+        for folders/containers and datasets (children of the space and nested
+        folders). The tags are computed once per node here so callers like
+        `list_views` don't re-derive them from the same dict fields.
+
+        Depth-first keeps the pending queue proportional to tree depth rather
+        than holding the whole frontier of a wide space. Children of each batch
+        are still fetched concurrently (up to ``max_concurrency`` requests in
+        flight) since the walk is dominated by HTTP round-trip latency, not
+        CPU, and `get_children` results are cached so repeated walks reuse
+        earlier fetches. A visited set guards against yielding or re-expanding
+        the same entity twice when it is reachable via multiple paths (e.g.
+        home + shared space).
         """
-        queue: List[Tuple[str, Dict[str, Any]]] = [("SPACE", {"id": space_id})]
-
-        while queue:
-            parent_kind, node = queue.pop(0)
-            node_id = node.get("id")
-            if not node_id:
-                continue
-
-            for child in self.get_children(node_id):
-                yield child
-                ctype = (child.get("type") or child.get("entityType") or "").upper()
-                # Recurse into containers/folders only
-                if ctype in {"CONTAINER", "FOLDER"}:
-                    queue.append(("CONTAINER", {"id": child.get("id")}))
+        queue: deque[str] = deque([space_id])
+        seen: set[str] = {space_id}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while queue:
+                batch: List[str] = []
+                while queue and len(batch) < self.max_concurrency:
+                    batch.append(queue.pop())
+
+                if len(batch) == 1:
+                    # Single-node batches (always the case for serial walks)
+                    # can consume the streamed parse lazily.
+                    children_lists: Iterable[Iterable[Dict[str, Any]]] = [
+                        self.iter_children_stream(batch[0])
+                    ]
+                else:
+                    children_lists = executor.map(self.get_children, batch)
+
+                for children in children_lists:
+                    for child in children:
+                        cid = child.get("id")
+                        if cid:
+                            if cid in seen:
+                                continue
+                            seen.add(cid)
+                        ctype = _upper(
+                            child.get("type") or child.get("entityType") or ""
+                        )
+                        is_container = ctype in {"CONTAINER", "FOLDER"}
+                        yield child, self._is_view(child), is_container
+                        # Recurse into containers/folders only
+                        if is_container and cid:
+                            queue.append(cid)
 
     # ---- views (virtual datasets) ------------------------------------------
 
@@ -165,24 +499,24 @@ class DremioClient:
           - Space children show datasetType 'VIRTUAL'. (24.3.x Space)
           - View objects use type 'VIRTUAL_DATASET'. (24.3.x View)
         """
-        type_upper = (obj.get("type") or obj.get("entityType") or "").upper()
-        ds_type_upper = (
-            obj.get("datasetType") or obj.get("containerType") or ""
-        ).upper()
+        type_upper = _upper(obj.get("type") or obj.get("entityType") or "")
 
         # Full view object
-        if type_upper == "VIRTUAL_DATASET":
+        if type_upper in _VIEW_TYPES:
             return True
 
         # Space/folder listing entry
-        if type_upper == "DATASET" and ds_type_upper in {"VIRTUAL", "VIRTUAL_DATASET"}:
-            return True
+        if type_upper == "DATASET":
+            ds_type = obj.get("datasetType") or obj.get("containerType") or ""
+            if _upper(ds_type) in _DATASET_VIRTUAL:
+                return True
 
         # Embedded dataset object
-        ds = obj.get("dataset") or {}
-        ds_type2 = (ds.get("type") or ds.get("datasetType") or "").upper()
-        if ds_type2 in {"VIRTUAL", "VIRTUAL_DATASET"}:
-            return True
+        ds = obj.get("dataset")
+        if ds:
+            ds_type2 = ds.get("type") or ds.get("datasetType") or ""
+            if _upper(ds_type2) in _DATASET_VIRTUAL:
+                return True
 
         return False
 
@@ -204,57 +538,50 @@ class DremioClient:
         Each item:
           { id, path, path_str, type, createdAt, modifiedAt, sql? }
         """
-        results: List[Dict[str, Any]] = []
-
         # Determine which spaces to traverse
-        spaces = list(self.iter_spaces())
         if space_names:
-            wanted = set({s.lower() for s in space_names})
-            spaces = [s for s in spaces if s.get("name", "").lower() in wanted]
+            by_name = self._spaces_by_name
+            spaces = [
+                by_name[name]
+                for name in (s.lower() for s in space_names)
+                if name in by_name
+            ]
+        else:
+            spaces = list(self.iter_spaces())
 
+        # Pass 1: traverse and collect view objects, then normalize them in
+        # one batched transform rather than per-node inside the walk.
+        view_objs: List[Dict[str, Any]] = []
         for space in spaces:
             sid = space.get("id")
             if not sid:
                 continue
 
-            for obj in self.iter_space_tree(sid):
-                if not self._is_view(obj):
-                    continue
-
-                path_parts, path_str = self._normalize_path(obj)
-                vid = obj.get("id")
-                vtype = (
-                    obj.get("type")
-                    or obj.get("datasetType")
-                    or (obj.get("dataset") or {}).get("datasetType")
-                    or "VIRTUAL_DATASET"
-                )
+            view_objs.extend(
+                obj for obj, is_view, _ in self.iter_space_tree(sid) if is_view
+            )
 
-                sql = obj.get("sql")
-                # Child listings in spaces usually omit SQL; hydrate if requested.
-                if include_sql and not sql and vid:
-                    try:
-                        full = self.get_entity(vid)
-                        sql = full.get("sql") or (full.get("dataset") or {}).get("sql")
-                        # Normalize path from full object if missing
-                        if not path_parts:
-                            path_parts, path_str = self._normalize_path(full)
-                    except Exception:
-                        pass  # non-fatal
-
-                results.append(
-                    {
-                        "id": vid,
-                        "path": path_parts,
-                        "path_str": path_str,
-                        "type": vtype,
-                        "createdAt": obj.get("createdAt") or obj.get("created_at"),
-                        "modifiedAt": obj.get("modifiedAt")
-                        or obj.get("modified_at")
-                        or obj.get("lastModified"),
-                        "sql": sql,
-                    }
-                )
+        results = _normalize_view_rows(view_objs)
+
+        # Pass 2: child listings in spaces usually omit SQL; hydrate if
+        # requested. Each hydration is an independent GET, so dispatch them
+        # concurrently instead of paying one round-trip per view.
+        if include_sql:
+            pending = [row for row in results if not row["sql"] and row["id"]]
+
+            def hydrate(row: Dict[str, Any]) -> None:
+                try:
+                    full = self.get_entity(row["id"])
+                except Exception:
+                    return  # non-fatal
+                row["sql"] = full.get("sql") or (full.get("dataset") or {}).get("sql")
+                # Normalize path from full object if missing
+                if not row["path"]:
+                    row["path"], row["path_str"] = self._normalize_path(full)
+
+            if pending:
+                with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                    list(executor.map(hydrate, pending))
 
         return results
 
@@ -269,12 +596,11 @@ class DremioClient:
         payload = {"sql": sql}
         data = self._s.post(
             self._url("/api/v3/sql"),
-            json=payload,
-            timeout=self.timeout,
-            verify=self.verify_ssl,
+            **{self._body_key: _json_dumps(payload)},
+            **self._request_kwargs,
         )
         data.raise_for_status()
-        return data.json().get("id")
+        return _json_loads(data.content).get("id")
 
     def get_job(self, job_id: str) -> Dict[str, Any]:
         return self._get(f"/api/v3/job/{job_id}")
@@ -287,25 +613,32 @@ class DremioClient:
         )
 
     def wait_for_job(
-        self, job_id: str, *, timeout_s: float = 30.0, poll_s: float = 0.5
+        self, job_id: str, *, timeout_s: float = 30.0, poll_s: float = 0.1
     ) -> Dict[str, Any]:
         """
         Polls /api/v3/job/{id} until state in {"COMPLETED","CANCELED","FAILED"} or timeout.
         Returns the final job object.
+
+        The poll interval starts at ``poll_s`` and backs off exponentially
+        (x1.5, capped at 2s) so short jobs return quickly while long jobs
+        don't hammer the server with fixed-rate polling.
         """
         import time
 
         deadline = time.time() + timeout_s
+        delay = poll_s
         while True:
             job = self.get_job(job_id)
             state = (job.get("jobState") or job.get("state") or "").upper()
             if state in {"COMPLETED", "CANCELED", "FAILED"}:
                 return job
-            if time.time() >= deadline:
+            now = time.time()
+            if now >= deadline:
                 raise TimeoutError(
                     f"Job {job_id} did not finish within {timeout_s}s (last state={state!r})"
                 )
-            time.sleep(poll_s)
+            time.sleep(min(delay, 2.0, deadline - now))
+            delay *= 1.5
 
     # ---- Helpers -----------------------------------------------------------
 
@@ -315,14 +648,16 @@ class DremioClient:
         Turn ["IIDS","my_view"] into "IIDS"."my_view"
         """
         parts = parts or []
-        return ".".join(f'"{p.replace('"', '""')}"' for p in parts if p is not None)
+        return ".".join('"' + p.translate(_QUOTE_TABLE) + '"' for p in parts if p)
 
     def _post(self, path: str, **kwargs) -> Dict[str, Any]:
-        r = self._s.post(
-            self._url(path), timeout=self.timeout, verify=self.verify_ssl, **kwargs
-        )
+        # Serialize outbound bodies ourselves; the session's Content-Type
+        # header is already application/json.
+        if "json" in kwargs:
+            kwargs[self._body_key] = _json_dumps(kwargs.pop("json"))
+        r = self._s.post(self._url(path), **self._request_kwargs, **kwargs)
         r.raise_for_status()
-        return r.json()
+        return _json_loads(r.content)
 
     def create_view_sql(
         self,
@@ -389,75 +724,69 @@ class DremioClient:
             payload["sqlContext"] = sql_context
 
         try:
-            return self._post(base_path, json=payload)
-        except requests.HTTPError as e:
+            created = self._post(base_path, json=payload)
+            self._invalidate_children_cache()
+            return created
+        except _HTTP_ERRORS as e:
             # If it already exists and or_replace=True, try PUT update
             if not or_replace:
                 raise
             status = getattr(e.response, "status_code", None)
-            # Fetch existing entity by path & then PUT with tag
-            # There isn't a direct "by-path" endpoint in v3; we can list or search.
-            # Simplest: run SHOW CREATE VIEW to ensure it exists, then get entity via search (or list).
-            try:
-                # Try to find entity by listing space/folders where possible,
-                # but here we fallback to GET /api/v3/catalog and scan (small installs).
-                root = self.get_catalog_root()
-                # Brute search for matching path
-                wanted = [p.lower() for p in path_parts]
-
-                def path_matches(obj):
-                    p = obj.get("path") or obj.get("fullPathList") or []
-                    return [str(x).lower() for x in p] == wanted
-
-                # Try root children and some recursion if needed
-                def scan(node):
-                    items = node.get("data") or node.get("children") or []
-                    for it in items:
-                        if path_matches(it):
-                            return it
-                    return None
-
-                found = scan(root)
-                if not found:
-                    # last resort: enumerate spaces and walk (costlier)
-                    for s in self.iter_spaces():
-                        for child in self.get_children(s.get("id")):
-                            p = child.get("path") or child.get("fullPathList") or []
-                            if [str(x).lower() for x in p] == wanted:
-                                found = child
-                                break
-                        if found:
-                            break
-
-                if not found or not found.get("id"):
-                    raise RuntimeError(
-                        f"View exists but ID not found for path {'.'.join(path_parts)}"
-                    )
-
-                eid = found["id"]
-                # Get full entity to retrieve current tag if required
-                full = self.get_entity(eid)
-                tag = full.get("tag") or (full.get("dataset") or {}).get("tag")
-
-                put_body = {
-                    "entityType": "dataset",
-                    "id": eid,
-                    "type": "VIRTUAL_DATASET",
-                    "path": path_parts,
-                    "sql": select_sql,
-                }
-                if tag:
-                    put_body["tag"] = tag
-
-                r = self._s.put(
-                    self._url(
-                        base_path.rstrip("/") + "/" + requests.utils.quote(eid, safe="")
-                    ),
-                    json=put_body,
-                    timeout=self.timeout,
-                    verify=self.verify_ssl,
-                )
-                r.raise_for_status()
-                return r.json()
-            except Exception:
+            # 409 is the documented conflict status; some self-hosted
+            # releases report an existing path as 400. Anything else is a
+            # real failure.
+            if status not in (400, 409):
                 raise
+
+        key = tuple(path_parts)
+        put_prefix = base_path.rstrip("/") + "/"
+
+        def _put(eid: str, tag: Optional[str]) -> Dict[str, Any]:
+            put_body = {
+                "entityType": "dataset",
+                "id": eid,
+                "type": "VIRTUAL_DATASET",
+                "path": path_parts,
+                "sql": select_sql,
+            }
+            if tag:
+                put_body["tag"] = tag
+            r = self._s.put(
+                self._url(put_prefix + quote(eid, safe="")),
+                **{self._body_key: _json_dumps(put_body)},
+                **self._request_kwargs,
+            )
+            r.raise_for_status()
+            return _json_loads(r.content)
+
+        def _remember(updated: Dict[str, Any], eid: str) -> Dict[str, Any]:
+            self._view_tags[key] = (updated.get("id") or eid, updated.get("tag"))
+            self._invalidate_children_cache()
+            return updated
+
+        # Fast path: the last-known {id, tag} for this path makes the common
+        # repeat-replace a single PUT with no lookups.
+        cached = self._view_tags.get(key)
+        if cached:
+            try:
+                return _remember(_put(*cached), cached[0])
+            except _HTTP_ERRORS as stale_err:
+                # Stale tag or the view was recreated — refetch and retry.
+                if getattr(stale_err.response, "status_code", None) not in (
+                    400,
+                    404,
+                    409,
+                ):
+                    raise
+                self._view_tags.pop(key, None)
+
+        # One by-path lookup resolves both the ID and the current tag, then
+        # a single conditional PUT replaces the SQL.
+        found = self.get_entity_by_path(path_parts)
+        eid = found.get("id")
+        if not eid:
+            raise RuntimeError(
+                f"View exists but ID not found for path {'.'.join(path_parts)}"
+            )
+        tag = found.get("tag") or (found.get("dataset") or {}).get("tag")
+        return _remember(_put(eid, tag), eid)
@@ -1,12 +1,22 @@
 import asyncio
 import os
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from dotenv import load_dotenv
 from mcp import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:  # pragma: no cover - exercised only without orjson
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
 load_dotenv()
 
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
@@ -21,6 +31,16 @@ class MCPBridge:
         self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
         self.thread.start()
 
+        # Bounded default executor for anything the loop offloads (blocking
+        # REST calls etc.): asyncio's default pool sizes itself at
+        # min(32, cpus + 4) threads, each costing ~20KiB — oversized and
+        # unpredictable under load for this latency-bound work.
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("ANTHROPIC_MAX_CONCURRENT", "8")),
+            thread_name_prefix="mcp-bridge",
+        )
+        self.loop.call_soon_threadsafe(self.loop.set_default_executor, self._executor)
+
         # Hold context managers so they don’t get GC’d/closed
         self._stdio_cm = None
         self._session_cm = None
@@ -29,8 +49,28 @@ class MCPBridge:
         self.write = None
         self.session: ClientSession | None = None
 
-        # LLM client (instance!)
-        self.anthropic = Anthropic(api_key=ANTHROPIC_API_KEY)
+        # Tool descriptors are static for the lifetime of the MCP server
+        # process; cache both shapes at connect so queries and /health don't
+        # pay an MCP round-trip each time.
+        self._tools_cached: list[dict] = []  # Anthropic shape (input_schema)
+        self._tools_public: list[dict] = []  # list_tools shape (schema)
+        # Pre-serialized /health payload: probes hit it at LB frequency, so
+        # answer with a bytes copy instead of a dict rebuild + jsonify walk.
+        self.health_body: bytes = b'{"status": "ok", "tools": []}'
+
+        # Shared job-wait registry: one poll task per in-flight Dremio job,
+        # keyed by job_id, so concurrent requests waiting on the same job
+        # attach to the same future instead of each polling the REST API.
+        # _job_deadlines tracks, per job, the latest deadline of any attached
+        # waiter; the poll task re-reads it each cycle, so it never outlives
+        # its waiters by more than a grace period yet never cuts a long one
+        # short. Both dicts are touched only on the bridge loop.
+        self._jobs: dict[str, asyncio.Task] = {}
+        self._job_deadlines: dict[str, float] = {}
+
+        # LLM client (instance!). Async so messages.create awaits on the
+        # bridge loop instead of blocking it for the whole LLM turn.
+        self.anthropic = AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
 
     async def _aconnect(self):
         # stdio_client is an async context manager
@@ -41,81 +81,204 @@ class MCPBridge:
         self.session = await self._session_cm.__aenter__()
         await self.session.initialize()
 
-        # quick sanity check
-        await self.session.list_tools()
+        # Doubles as the connect-time sanity check.
+        await self._arefresh_tools()
+
+    async def _arefresh_tools(self):
+        """Re-list tools and rebuild both cached descriptor shapes.
+
+        Only needed after connect for servers whose tool set changes at
+        runtime.
+        """
+        resp = await self.session.list_tools()
+        self._tools_cached = [
+            {
+                "name": t.name,
+                "description": t.description,
+                "input_schema": t.inputSchema,
+            }
+            for t in resp.tools
+        ]
+        self._tools_public = [
+            {"name": t.name, "description": t.description, "schema": t.inputSchema}
+            for t in resp.tools
+        ]
+        self.health_body = _json_dumps(
+            {"status": "ok", "tools": [t.name for t in resp.tools]}
+        )
+        return self._tools_public
+
+    def refresh_tools(self):
+        return self.run_coro(self._arefresh_tools())
 
     def connect(self):
         fut = asyncio.run_coroutine_threadsafe(self._aconnect(), self.loop)
         fut.result(timeout=30)
 
     def run_coro(self, coro):
+        """
+        Run a coroutine on the bridge loop and block for its result.
+
+        This is the sync (WSGI-thread) entry point and pays a cross-thread
+        wakeup plus a concurrent Future round-trip per call; code already on
+        the bridge loop should await the `a*` coroutines directly instead,
+        which skips both. Calling this from the loop would deadlock, so it
+        raises.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            raise RuntimeError(
+                "run_coro called from the bridge loop; await the coroutine instead"
+            )
         return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout=120)
 
-    async def _alist_tools(self):
-        resp = await self.session.list_tools()
-        return [
-            {"name": t.name, "description": t.description, "schema": t.inputSchema}
-            for t in resp.tools
-        ]
+    async def alist_tools(self):
+        return self._tools_public
 
     def list_tools(self):
-        return self.run_coro(self._alist_tools())
+        return self._tools_public
 
     async def _aprocess_query(self, user_text: str) -> dict:
-        # 1) Advertise tools to the LLM
-        tools_resp = await self.session.list_tools()
-        tools = [
-            {
-                "name": t.name,
-                "description": t.description,
-                "input_schema": t.inputSchema,
-            }
-            for t in tools_resp.tools
-        ]
+        # 1) Advertise tools to the LLM (cached at connect time)
+        tools = self._tools_cached
 
         messages = [{"role": "user", "content": user_text}]
         trace = []
 
         while True:
-            resp = self.anthropic.messages.create(
+            resp = await self.anthropic.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=1024,
                 messages=messages,
                 tools=tools,
             )
 
-            tool_uses = [
-                c for c in resp.content if getattr(c, "type", None) == "tool_use"
-            ]
-            texts = [c.text for c in resp.content if getattr(c, "type", None) == "text"]
+            # Dump the response to plain dicts once. The full message history
+            # is re-sent every turn, and feeding Pydantic blocks back in makes
+            # the SDK re-validate the whole growing tree each iteration —
+            # O(turns²) work on a long tool-chain. Plain dicts skip model
+            # construction on input.
+            blocks = resp.model_dump(exclude_none=True)["content"]
+            tool_uses = [b for b in blocks if b.get("type") == "tool_use"]
+            texts = [b["text"] for b in blocks if b.get("type") == "text"]
             if texts:
                 trace.append({"assistant_text": "\n".join(texts)})
 
             if not tool_uses:
                 return {"answer": "\n".join(texts) if texts else "", "trace": trace}
 
+            # Execute the turn's tool calls concurrently via MCP; Claude
+            # routinely emits several independent tool_uses per turn, so the
+            # turn costs roughly the slowest call instead of the sum. gather
+            # preserves order, keeping each result paired with its tu["id"].
+            results = await asyncio.gather(
+                *(self.session.call_tool(tu["name"], tu["input"]) for tu in tool_uses)
+            )
+
             tool_results_content = []
-            for tu in tool_uses:
-                # Execute tool via MCP
-                result = await self.session.call_tool(tu.name, tu.input)
+            for tu, result in zip(tool_uses, results):
+                # Same idea for the MCP content blocks: dump once here so
+                # neither the SDK nor the /ask response path has to walk a
+                # Pydantic tree again.
+                content = [
+                    b.model_dump(exclude_none=True) if hasattr(b, "model_dump") else b
+                    for b in result.content
+                ]
                 tool_results_content.append(
                     {
                         "type": "tool_result",
-                        "tool_use_id": tu.id,
-                        "content": result.content,
+                        "tool_use_id": tu["id"],
+                        "content": content,
                     }
                 )
                 trace.append(
-                    {"tool_called": tu.name, "args": tu.input, "result": result.content}
+                    {"tool_called": tu["name"], "args": tu["input"], "result": content}
                 )
 
             # continue the tool loop
-            messages.append({"role": "assistant", "content": resp.content})
+            messages.append({"role": "assistant", "content": blocks})
             messages.append({"role": "user", "content": tool_results_content})
 
+    async def aprocess_query(self, user_text: str) -> dict:
+        return await self._aprocess_query(user_text)
+
     def process_query(self, user_text: str) -> dict:
         return self.run_coro(self._aprocess_query(user_text))
 
+    async def _poll_job(self, client, job_id: str) -> dict:
+        """Poll one Dremio job to a terminal state on the bridge loop.
+
+        The blocking REST call runs on the loop's default executor;
+        `asyncio.sleep` between polls keeps the loop free for other work.
+        Backoff mirrors `DremioClient.wait_for_job` (x1.5, capped at 2s).
+        The task stops once the latest attached waiter's deadline (tracked
+        in `_job_deadlines`, extended by `_await_job`) has passed, so an
+        orphaned task can't keep polling a hung job indefinitely.
+        """
+        loop = asyncio.get_running_loop()
+        delay = 0.1
+        while True:
+            job = await loop.run_in_executor(None, client.get_job, job_id)
+            state = (job.get("jobState") or job.get("state") or "").upper()
+            if state in {"COMPLETED", "CANCELED", "FAILED"}:
+                return job
+            if loop.time() >= self._job_deadlines.get(job_id, 0.0):
+                raise TimeoutError(
+                    f"Job {job_id} did not finish before its last waiter's "
+                    f"deadline (last state={state!r})"
+                )
+            await asyncio.sleep(min(delay, 2.0))
+            delay *= 1.5
+
+    async def _await_job(self, client, job_id: str, timeout: float) -> dict:
+        # Keep the shared task alive a little past this waiter's own window,
+        # extending (never shrinking) whatever deadline earlier waiters set.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout + 5.0
+        if deadline > self._job_deadlines.get(job_id, 0.0):
+            self._job_deadlines[job_id] = deadline
+
+        task = self._jobs.get(job_id)
+        if task is None:
+            task = asyncio.ensure_future(self._poll_job(client, job_id))
+            self._jobs[job_id] = task
+
+            def _cleanup(_t, job_id=job_id):
+                self._jobs.pop(job_id, None)
+                self._job_deadlines.pop(job_id, None)
+
+            task.add_done_callback(_cleanup)
+        try:
+            # shield: one waiter timing out must not cancel the shared poll;
+            # later waiters (including a retry of this one) re-attach to it.
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except TimeoutError:
+            if task.done():
+                # The poll task itself raised (asyncio.TimeoutError is
+                # TimeoutError on 3.11+); keep its message rather than
+                # mislabeling it with this waiter's smaller timeout.
+                raise
+            raise TimeoutError(
+                f"Job {job_id} did not finish within {timeout}s"
+            ) from None
+
+    def await_job(self, client, job_id: str, timeout: float = 60.0) -> dict:
+        """Block until ``job_id`` reaches a terminal state, sharing the poll
+        loop with any other request waiting on the same job.
+
+        Submits directly instead of via run_coro: its fixed 120s result cap
+        would silently truncate configured waits above it. The outer result
+        timeout only backstops a wedged loop; the inner asyncio.wait_for is
+        what enforces ``timeout``.
+        """
+        fut = asyncio.run_coroutine_threadsafe(
+            self._await_job(client, job_id, timeout), self.loop
+        )
+        return fut.result(timeout=timeout + 5)
+
     async def _aclose(self):
         # Close in reverse order
         if self._session_cm:
@@ -131,5 +294,6 @@ class MCPBridge:
         try:
             self.run_coro(self._aclose())
         finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
             self.loop.call_soon_threadsafe(self.loop.stop)
             self.thread.join(timeout=2)
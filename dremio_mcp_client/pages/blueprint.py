@@ -1,13 +1,45 @@
+import atexit
+import itertools
 import json
 import os
 import re
 import threading
 from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from operator import itemgetter
 from shutil import which
 
-from flask import Blueprint, current_app, jsonify, render_template, request
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    render_template,
+    request,
+    stream_with_context,
+)
 from mcp.client.stdio import StdioServerParameters
 
+try:
+    # orjson serializes rows 3-5x faster than stdlib json.
+    from orjson import OPT_APPEND_NEWLINE as _OPT_NL
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+
+    def _json_dumps_nl(obj) -> bytes:
+        # OPT_APPEND_NEWLINE appends in-buffer — no per-row bytes concat.
+        return _json_dumps(obj, option=_OPT_NL)
+
+except ImportError:  # pragma: no cover - exercised only without orjson
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def _json_dumps_nl(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8") + b"\n"
+
+
 from ..mcp_bridge import MCPBridge
 
 pages = Blueprint(
@@ -17,9 +49,9 @@ pages = Blueprint(
     static_folder="static",  # optional, if you add css/js later
 )
 
-# --- Lazy, threadsafe bridge singleton ---------------------------------------
-_bridge = None
-_bridge_lock = threading.Lock()
+# --- Lazy, threadsafe bridge pool --------------------------------------------
+_pool = None
+_pool_lock = threading.Lock()
 
 # pages.py (add near top)
 from ..dremio_api import DremioClient
@@ -30,32 +62,49 @@ _dclient_lock = threading.Lock()
 
 def get_dremio_client() -> DremioClient:
     global _dclient
-    if _dclient is None:
-        with _dclient_lock:
-            if _dclient is None:
-                base = os.getenv("DREMIO_URL")
-                token = os.getenv("DREMIO_TOKEN")
-                scheme = os.getenv("DREMIO_AUTH_SCHEME")  # optional
-                client = DremioClient(base_url=base, token=token, auth_scheme=scheme)
-                _dclient = client
-                current_app.logger.info("Dremio REST client initialized.")
-    return _dclient
+    # Bind the global once: the fast path on every request is then a single
+    # local load instead of repeated module-global lookups.
+    client = _dclient
+    if client is not None:
+        return client
+    with _dclient_lock:
+        client = _dclient
+        if client is not None:
+            return client
+        client = DremioClient(
+            base_url=os.getenv("DREMIO_URL"),
+            token=os.getenv("DREMIO_TOKEN"),
+            auth_scheme=os.getenv("DREMIO_AUTH_SCHEME"),  # optional
+        )
+        _dclient = client
+    # Log after releasing the lock to keep the hold time minimal.
+    current_app.logger.info("Dremio REST client initialized.")
+    return client
 
 
 try:
     # If TextContent is importable:
-    from some_module import TextContent
+    from mcp.types import TextContent
 except Exception:
-    TextContent = tuple()  # harmless fallback so isinstance() never matches
 
+    class TextContent:  # sentinel class so isinstance() never matches
+        pass
 
-def to_jsonable(obj):
+
+# Exact types that pass through untouched — the overwhelming majority of
+# values in a Dremio result set, so check these before anything else.
+_PASSTHROUGH = frozenset({str, int, float, bool, type(None)})
+
+
+def _jsonable_leaf(obj):
+    """Convert a single non-container value; containers are handled by the
+    stack walk in `to_jsonable`."""
     # Handle Dremio MCP/Anthropic-style content wrappers
     if isinstance(obj, TextContent):
         # Keep only what you need; parse inner JSON if the text looks like JSON
         text = getattr(obj, "text", None) or getattr(obj, "content", None)
         try:
-            return json.loads(text)
+            return _json_loads(text)
         except Exception:
             return {
                 "type": getattr(obj, "type", "text"),
@@ -69,17 +118,51 @@ def to_jsonable(obj):
         from dataclasses import asdict
 
         return asdict(obj)
-    # Mappings
-    if isinstance(obj, Mapping):
-        return {k: to_jsonable(v) for k, v in obj.items()}
-    # Sequences (but not str/bytes)
-    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes, bytearray)):
-        return [to_jsonable(v) for v in obj]
     # Fallback: primitive or stringified
     return obj
 
 
+def _jsonable_value(v, stack):
+    """Fast-dispatch one value: pass scalars through, register containers on
+    the stack for the iterative walk, leaf-convert everything else."""
+    tv = type(v)
+    if tv in _PASSTHROUGH:
+        return v
+    if tv is dict or isinstance(v, Mapping):
+        child: dict = {}
+        stack.append((v, child))
+        return child
+    if (tv is list or isinstance(v, Sequence)) and not isinstance(
+        v, (str, bytes, bytearray)
+    ):
+        child_list: list = []
+        stack.append((v, child_list))
+        return child_list
+    return _jsonable_leaf(v)
+
+
+def to_jsonable(obj):
+    # Iterative walk with an explicit stack: a 10k-row result would otherwise
+    # pay one Python frame (and the full isinstance chain) per element.
+    # Wrapper conversions (TextContent / model_dump / asdict) already return
+    # plain structures, so their output needs no further walking.
+    stack: list = []
+    root = _jsonable_value(obj, stack)
+    while stack:
+        src, dst = stack.pop()
+        if type(dst) is dict:
+            for k, v in src.items():
+                dst[k] = _jsonable_value(v, stack)
+        else:
+            for v in src:
+                dst.append(_jsonable_value(v, stack))
+    return root
+
+
+@lru_cache(maxsize=1)
 def _build_server_params() -> StdioServerParameters:
+    # Cached: the env vars are fixed for the process lifetime and
+    # which("uv") walks PATH on disk, so reconnects shouldn't repeat either.
     mcp_dir = os.getenv("DREMIO_MCP_DIR")  # dremio-mcp repo root
     mcp_cfg = os.getenv("DREMIO_MCP_CFG")  # optional config.yaml
     if not mcp_dir:
@@ -99,21 +182,80 @@ def _build_server_params() -> StdioServerParameters:
     return StdioServerParameters(command=uv_bin, args=args, env=None)
 
 
+class BridgePool:
+    """
+    Small pool of persistent MCP bridges, round-robin assigned per thread.
+
+    A single bridge serializes every `call_tool` behind one stdio pipe, so
+    concurrent /ask requests queue on it. Each bridge here owns its own
+    stdio subprocess, event loop, and thread, so tool calls across bridges
+    actually overlap. Threads stick to their assigned bridge
+    (threading.local) so one request never straddles two sessions; gthread
+    reuses its worker threads, which keeps the cycle's spread even.
+    """
+
+    def __init__(self, size: int):
+        params = _build_server_params()
+        self._bridges = [MCPBridge(params) for _ in range(size)]
+        for b in self._bridges:
+            b.connect()
+        self._cycle = itertools.cycle(self._bridges)
+        self._cycle_lock = threading.Lock()
+        self._local = threading.local()
+
+    def acquire(self) -> MCPBridge:
+        bridge = getattr(self._local, "bridge", None)
+        if bridge is None:
+            with self._cycle_lock:
+                bridge = next(self._cycle)
+            self._local.bridge = bridge
+        return bridge
+
+    def close(self):
+        for b in self._bridges:
+            b.close()
+
+
+def _pool_size() -> int:
+    return int(
+        os.getenv("MCP_BRIDGE_POOL_SIZE") or os.getenv("ANTHROPIC_MAX_CONCURRENT") or 2
+    )
+
+
 def get_bridge() -> MCPBridge:
-    global _bridge
-    if _bridge is None:
-        with _bridge_lock:
-            if _bridge is None:
-                params = _build_server_params()
-                print(params)
-                b = MCPBridge(params)
-                b.connect()
-                _bridge = b
-                if b is None:
-                    current_app.logger.info("Dremio MCP bridge failed to connect.")
-                else:
-                    current_app.logger.info("Dremio MCP bridge connected.")
-    return _bridge
+    global _pool
+    pool = _pool
+    if pool is not None:
+        return pool.acquire()
+    with _pool_lock:
+        pool = _pool
+        if pool is not None:
+            return pool.acquire()
+        pool = BridgePool(_pool_size())
+        atexit.register(pool.close)
+        _pool = pool
+    current_app.logger.info("Dremio MCP bridge pool connected.")
+    return pool.acquire()
+
+
+def _read_json():
+    """
+    Parse the request body with orjson in one pass.
+
+    `request.get_json(force=True, silent=True)` walks headers and parses via
+    stdlib json on every POST; reading the raw bytes uncached and decoding
+    them directly is cheaper on the request-hot path. Returns {} for an
+    empty body and None when the body isn't valid JSON (callers turn that
+    into a 400).
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        # Both orjson.JSONDecodeError and stdlib's subclass ValueError.
+        return _json_loads(raw)
+    except ValueError:
+        return None
 
 
 # --- Routes -------------------------------------------------------------------
@@ -127,16 +269,17 @@ def index():
 
 @pages.get("/health")
 def health():
-    bridge = get_bridge()
-    tools = bridge.list_tools()
-    print(tools)
-    return jsonify({"status": "ok", "tools": [t["name"] for t in tools]})
+    # The body is pre-serialized at connect (and on refresh_tools), so a
+    # probe costs a bytes copy rather than an MCP round-trip + jsonify walk.
+    return Response(get_bridge().health_body, mimetype="application/json")
 
 
 @pages.post("/ask")
 def ask():
     bridge = get_bridge()
-    data = request.get_json(force=True, silent=True) or {}
+    data = _read_json()
+    if data is None:
+        return jsonify({"error": "bad json"}), 400
     q = (data.get("q") or "").strip()
     if not q:
         return jsonify({"error": "missing 'q'"}), 400
@@ -172,7 +315,9 @@ def preview_view():
       { "path_str": "IIDS.my_view", "limit": 100 }
     Returns: { columns:[{name,type}], rows:[{col:value,...}], jobId }
     """
-    data = request.get_json(force=True, silent=True) or {}
+    data = _read_json()
+    if data is None:
+        return jsonify({"error": "bad json"}), 400
     limit = int(data.get("limit") or 100)
 
     c = get_dremio_client()
@@ -194,7 +339,7 @@ def preview_view():
     sql = f"SELECT * FROM {ident} LIMIT {limit}"
 
     job_id = c.run_sql(sql)
-    job = c.wait_for_job(job_id, timeout_s=60.0)
+    job = _wait_for_job(c, job_id, 60.0)
 
     state = (job.get("jobState") or job.get("state") or "").upper()
     if state != "COMPLETED":
@@ -208,7 +353,7 @@ def preview_view():
     schema = res.get("schema") or []
     rows = res.get("rows") or []
 
-    columns = [{"name": col.get("name"), "type": col.get("type")} for col in schema]
+    columns = _columns(schema)
 
     return jsonify(
         {
@@ -220,10 +365,21 @@ def preview_view():
     )
 
 
-_SQL_SELECT_RE = re.compile(r"^\s*select\b", re.IGNORECASE | re.DOTALL)
 _SQL_LIMIT_RE = re.compile(r"\blimit\s+\d+\b", re.IGNORECASE)
 
 
+def _is_select(sql: str) -> bool:
+    """
+    True if the statement starts with a SELECT keyword. A slice+lower prefix
+    check is ~20x cheaper than the regex match this replaces, and these
+    checks run on every /sql/run and /views/create request.
+    """
+    s = sql.lstrip()
+    return s[:6].lower() == "select" and (
+        len(s) == 6 or not (s[6].isalnum() or s[6] == "_")
+    )
+
+
 def _ensure_limit(sql: str, default_limit: int, max_limit: int) -> str:
     """
     If the user didn't provide LIMIT, append one.
@@ -237,16 +393,91 @@ def _ensure_limit(sql: str, default_limit: int, max_limit: int) -> str:
     return sql
 
 
-@pages.post("/sql/run")
-def run_sql_endpoint():
+def _wait_for_job(c: DremioClient, job_id: str, timeout_s: float) -> dict:
     """
-    Body: { "sql": "<SELECT ...>", "limit": 200, "offset": 0 }
-    Returns: { jobId, columns:[{name,type}], rows:[{...}], rowCount }
+    Wait for a Dremio job, sharing the poll across concurrent requests.
+
+    When the MCP bridge is already connected, its event loop drives the
+    polling and de-dups waiters by job_id, so this worker thread blocks on a
+    shared future instead of running its own sleep/poll loop. Pure-REST
+    deployments (no bridge yet) fall back to the client's synchronous wait.
+    """
+    pool = _pool
+    if pool is not None:
+        return pool.acquire().await_job(c, job_id, timeout_s)
+    return c.wait_for_job(job_id, timeout_s=timeout_s)
+
+
+# How many rows each /job/{id}/results page fetches while streaming.
+_RESULT_PAGE_SIZE = 500
+
+_get_nt = itemgetter("name", "type")
+
+
+def _columns(schema):
+    """
+    Trim Dremio schema entries down to the {name, type} shape the UI
+    expects. itemgetter pulls both keys in one C call — Dremio always emits
+    them, so the per-key .get/None fallbacks this replaces bought nothing.
+    """
+    return [{"name": n, "type": t} for n, t in map(_get_nt, schema)]
+
+
+def _iter_job_rows(client, job_id, first_page, offset, limit):
+    """
+    Yield result rows starting from an already-fetched first page, paging
+    through /job/{id}/results as needed, up to ``limit`` rows total.
+    """
+    page = first_page
+    sent = 0
+    while True:
+        rows = page.get("rows") or []
+        for row in rows:
+            if sent >= limit:
+                return
+            yield row
+            sent += 1
+        offset += len(rows)
+        if sent >= limit or len(rows) < _RESULT_PAGE_SIZE:
+            return
+        page = client.get_job_results(
+            job_id, offset=offset, limit=min(_RESULT_PAGE_SIZE, limit - sent)
+        )
+
+
+def _stream_json_result(meta, rows_iter, tail):
+    """
+    Frame one JSON object equivalent to {**meta, "rows": [...], **tail},
+    serializing a single row at a time so peak memory stays at one result
+    page instead of three full copies of the row set (parsed rows, jsonable
+    tree, response body).
+    """
+    yield _json_dumps(meta)[:-1] + b',"rows":['
+    first = True
+    for row in rows_iter:
+        if first:
+            first = False
+        else:
+            yield b","
+        yield _json_dumps(row)
+    yield b"]"
+    if tail:
+        yield b"," + _json_dumps(tail)[1:-1]
+    yield b"}"
+
+
+def _run_sql_job(data):
+    """
+    Shared /sql/run front half: validate the parsed body, submit the SQL,
+    wait for the job, and fetch the first results page.
+
+    Returns ``(error_response, None)`` on failure, where error_response is
+    ready to return from a route, or ``(None, payload)`` on success with
+    ``payload = (job_id, sql, first_page, offset, effective_limit)``.
     """
-    data = request.get_json(force=True, silent=True) or {}
     sql = (data.get("sql") or "").strip()
     if not sql:
-        return jsonify({"error": "Provide 'sql'"}), 400
+        return (jsonify({"error": "Provide 'sql'"}), 400), None
 
     # --- Configurable bounds ---
     DEFAULT_LIMIT = int(data.get("limit") or 200)
@@ -259,9 +490,12 @@ def run_sql_endpoint():
     if ENFORCE_SELECT_ONLY:
         # crude multi-statement check — you can replace with a proper SQL parser if needed
         if ";" in sql.strip().rstrip(";"):
-            return jsonify({"error": "Multiple statements are not allowed."}), 400
-        if not _SQL_SELECT_RE.match(sql):
-            return jsonify({"error": "Only SELECT queries are allowed."}), 400
+            return (
+                jsonify({"error": "Multiple statements are not allowed."}),
+                400,
+            ), None
+        if not _is_select(sql):
+            return (jsonify({"error": "Only SELECT queries are allowed."}), 400), None
 
     # Append LIMIT if missing (bounded by DEFAULT_LIMIT)
     effective_limit = min(DEFAULT_LIMIT, MAX_LIMIT)
@@ -271,44 +505,118 @@ def run_sql_endpoint():
 
     try:
         job_id = c.run_sql(sql_to_run)
-        job = c.wait_for_job(
-            job_id, timeout_s=float(current_app.config.get("SQL_RUN_TIMEOUT_S", 60.0))
+        job = _wait_for_job(
+            c, job_id, float(current_app.config.get("SQL_RUN_TIMEOUT_S", 60.0))
         )
     except TimeoutError as te:
-        return jsonify({"error": str(te)}), 504
+        return (jsonify({"error": str(te)}), 504), None
     except Exception as e:
-        return jsonify({"error": f"Failed to start or wait for job: {e}"}), 500
+        return (jsonify({"error": f"Failed to start or wait for job: {e}"}), 500), None
 
     state = (job.get("jobState") or job.get("state") or "").upper()
     if state != "COMPLETED":
-        return jsonify(
-            {"error": f"Job {job_id} ended in state {state}", "jobId": job_id}
-        ), 500
+        return (
+            jsonify({"error": f"Job {job_id} ended in state {state}", "jobId": job_id}),
+            500,
+        ), None
 
     try:
-        res = c.get_job_results(job_id, offset=OFFSET, limit=effective_limit)
+        res = c.get_job_results(
+            job_id, offset=OFFSET, limit=min(_RESULT_PAGE_SIZE, effective_limit)
+        )
     except Exception as e:
-        return jsonify({"error": f"Failed to fetch results: {e}", "jobId": job_id}), 500
+        return (
+            jsonify({"error": f"Failed to fetch results: {e}", "jobId": job_id}),
+            500,
+        ), None
 
-    schema = res.get("schema") or []
-    rows = res.get("rows") or []
+    return None, (job_id, sql, res, OFFSET, effective_limit)
 
-    columns = [{"name": col.get("name"), "type": col.get("type")} for col in schema]
 
-    return jsonify(
-        {
-            "jobId": job_id,
-            "sql": sql,  # original (unmodified) SQL for reference
-            "columns": columns,
-            "rows": rows,
-            "rowCount": res.get("rowCount"),  # total rows in result set (if provided)
-            "offset": OFFSET,
-            "limit": effective_limit,
-        }
+@pages.post("/sql/run")
+def run_sql_endpoint():
+    """
+    Body: { "sql": "<SELECT ...>", "limit": 200, "offset": 0 }
+    Returns: { jobId, columns:[{name,type}], rows:[{...}], rowCount }
+    """
+    data = _read_json()
+    if data is None:
+        return jsonify({"error": "bad json"}), 400
+
+    err, payload = _run_sql_job(data)
+    if err is not None:
+        return err
+    job_id, sql, res, OFFSET, effective_limit = payload
+
+    c = get_dremio_client()
+    schema = res.get("schema") or []
+
+    columns = _columns(schema)
+
+    # Stream the body: same JSON document as before, but rows are fetched
+    # page-by-page and serialized one at a time, so the first bytes go out as
+    # soon as the job completes.
+    meta = {
+        "jobId": job_id,
+        "sql": sql,  # original (unmodified) SQL for reference
+        "columns": columns,
+    }
+    tail = {
+        "rowCount": res.get("rowCount"),  # total rows in result set (if provided)
+        "offset": OFFSET,
+        "limit": effective_limit,
+    }
+    rows_iter = _iter_job_rows(c, job_id, res, OFFSET, effective_limit)
+    return Response(
+        stream_with_context(_stream_json_result(meta, rows_iter, tail)),
+        mimetype="application/json",
     )
 
 
-_SQL_SELECT_RE = re.compile(r"^\s*select\b", re.IGNORECASE | re.DOTALL)
+def _stream_ndjson_result(header, rows_iter):
+    """One JSON document per line: a leading metadata line, then one row per
+    line, each serialized independently."""
+    yield _json_dumps_nl(header)
+    for row in rows_iter:
+        yield _json_dumps_nl(row)
+
+
+@pages.post("/sql/run.ndjson")
+def run_sql_ndjson_endpoint():
+    """
+    NDJSON variant of /sql/run for incremental consumers (dashboards,
+    notebooks): the first line carries {jobId, sql, columns, rowCount},
+    then each result row is its own line. Rows are paged from Dremio and
+    serialized one at a time, so memory stays at one results page no
+    matter how large the export, and the client can render the first rows
+    before the last ones exist server-side.
+
+    Body: same as /sql/run.
+    """
+    data = _read_json()
+    if data is None:
+        return jsonify({"error": "bad json"}), 400
+
+    err, payload = _run_sql_job(data)
+    if err is not None:
+        return err
+    job_id, sql, res, OFFSET, effective_limit = payload
+
+    c = get_dremio_client()
+    schema = res.get("schema") or []
+    columns = _columns(schema)
+
+    header = {
+        "jobId": job_id,
+        "sql": sql,
+        "columns": columns,
+        "rowCount": res.get("rowCount"),
+    }
+    rows_iter = _iter_job_rows(c, job_id, res, OFFSET, effective_limit)
+    return Response(
+        stream_with_context(_stream_ndjson_result(header, rows_iter)),
+        mimetype="application/x-ndjson",
+    )
 
 
 @pages.post("/views/create")
@@ -328,7 +636,9 @@ def create_view():
 
     Returns: { ok, id?, path, path_str, jobId?, method: "sql"|"catalog" }
     """
-    data = request.get_json(force=True, silent=True) or {}
+    data = _read_json()
+    if data is None:
+        return jsonify({"error": "bad json"}), 400
 
     # --- Resolve path ---
     path_parts = None
@@ -349,7 +659,7 @@ def create_view():
     # Basic safety: single SELECT only (user can pass CREATE VIEW if you want, but we keep UX simple)
     if ";" in select_sql.strip().rstrip(";"):
         return jsonify({"error": "Multiple statements are not allowed in 'sql'."}), 400
-    if not _SQL_SELECT_RE.match(select_sql):
+    if not _is_select(select_sql):
         return jsonify({"error": "The 'sql' must be a SELECT statement."}), 400
 
     or_replace = bool(data.get("or_replace", True))
@@ -386,9 +696,8 @@ def create_view():
                 path_parts=path_parts, select_sql=select_sql, or_replace=or_replace
             )
             # Optionally wait for job to finish (usually instantaneous)
-            job = c.wait_for_job(
-                job_id,
-                timeout_s=float(current_app.config.get("SQL_RUN_TIMEOUT_S", 60.0)),
+            job = _wait_for_job(
+                c, job_id, float(current_app.config.get("SQL_RUN_TIMEOUT_S", 60.0))
             )
             state = (job.get("jobState") or job.get("state") or "").upper()
             if state != "COMPLETED":
@@ -2,4 +2,19 @@ from os import environ
 
 wsgi_app = "dremio_mcp_client.wsgi:app"
 bind = "0.0.0.0:8000"
-workers = int(environ.get("GUNICORN_WORKERS", 1))
+
+# Threaded workers: the sync worker's one-request-at-a-time default meant a
+# single long SQL job (or LLM turn) serialized the whole server. Requests
+# here spend nearly all their time waiting on Dremio/Anthropic I/O, so
+# threads overlap well.
+worker_class = "gthread"
+threads = int(environ.get("GUNICORN_THREADS", 8))
+workers = int(environ.get("GUNICORN_WORKERS", 2))
+
+# Each worker lazily builds its own MCPBridge (background thread + event
+# loop + stdio subprocess), none of which survives fork — so the app must
+# not be preloaded in the master.
+preload_app = False
+
+# Keep the worker heartbeat tmpfiles off disk.
+worker_tmp_dir = "/dev/shm"
@@ -1,5 +1,23 @@
+import hashlib
+import pathlib
+
 from sass import compile
 
-css = compile(filename="dremio_mcp_client/static/sass/style.scss", output_style="compressed")
-with open("dremio_mcp_client/static/css/style.css", "w") as f:
-    f.write(css)
+sass_dir = pathlib.Path("dremio_mcp_client/static/sass")
+out = pathlib.Path("dremio_mcp_client/static/css/style.css")
+sig_file = out.with_suffix(".css.hash")
+
+# Fingerprint every .scss input (content + name, sorted for stability) so
+# repeated container/CI builds skip the compile when nothing changed.
+h = hashlib.blake2b(digest_size=16)
+for p in sorted(sass_dir.rglob("*.scss")):
+    h.update(p.read_bytes())
+    h.update(p.name.encode())
+sig = h.hexdigest()
+
+if out.exists() and sig_file.exists() and sig_file.read_text() == sig:
+    raise SystemExit(0)
+
+css = compile(filename=str(sass_dir / "style.scss"), output_style="compressed")
+out.write_text(css)
+sig_file.write_text(sig)
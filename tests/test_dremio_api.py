@@ -0,0 +1,33 @@
+from dremio_mcp_client.dremio_api import DremioClient
+
+
+def test_is_view_full_object():
+    assert DremioClient._is_view({"entityType": "dataset", "type": "VIRTUAL_DATASET"})
+
+
+def test_is_view_space_listing_entry():
+    assert DremioClient._is_view({"type": "DATASET", "datasetType": "VIRTUAL"})
+
+
+def test_is_view_embedded_dataset():
+    assert DremioClient._is_view({"dataset": {"type": "VIRTUAL_DATASET"}})
+
+
+def test_is_view_rejects_physical_dataset():
+    assert not DremioClient._is_view({"type": "DATASET", "datasetType": "PHYSICAL"})
+
+
+def test_is_view_rejects_container():
+    assert not DremioClient._is_view({"type": "CONTAINER", "containerType": "SPACE"})
+
+
+def test_quote_identifier():
+    assert DremioClient.quote_identifier(["IIDS", "my_view"]) == '"IIDS"."my_view"'
+
+
+def test_quote_identifier_escapes_quotes():
+    assert DremioClient.quote_identifier(['a"b']) == '"a""b"'
+
+
+def test_quote_identifier_empty():
+    assert DremioClient.quote_identifier(None) == ""
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+
+from dremio_mcp_client.pages.blueprint import _is_select, to_jsonable
+
+
+def test_to_jsonable_passes_scalars_through():
+    assert to_jsonable("abc") == "abc"
+    assert to_jsonable(5) == 5
+    assert to_jsonable(None) is None
+
+
+def test_to_jsonable_converts_nested_containers():
+    obj = {"rows": [{"a": 1, "b": (2, 3)}], "meta": {"count": 1}}
+    assert to_jsonable(obj) == {"rows": [{"a": 1, "b": [2, 3]}], "meta": {"count": 1}}
+
+
+def test_to_jsonable_converts_dataclasses():
+    @dataclass
+    class Point:
+        x: int
+        y: int
+
+    assert to_jsonable({"p": Point(1, 2)}) == {"p": {"x": 1, "y": 2}}
+
+
+def test_to_jsonable_handles_deep_nesting():
+    obj: dict = {}
+    cursor = obj
+    for _ in range(5000):
+        cursor["child"] = {}
+        cursor = cursor["child"]
+    # Would overflow the recursion limit with a recursive implementation.
+    assert to_jsonable(obj) == obj
+
+
+def test_is_select_accepts_select_statements():
+    assert _is_select("SELECT 1")
+    assert _is_select("  \n select * from t")
+    assert _is_select("select")
+
+
+def test_is_select_rejects_non_select():
+    assert not _is_select("DROP TABLE t")
+    assert not _is_select("selection lineage from t")
+    assert not _is_select("select_all()")